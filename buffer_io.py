@@ -0,0 +1,59 @@
+"""
+buffer_io
+---------
+Stream a bytes-like object (memoryview, mmap, bytearray) as a binary file
+without copying it.
+
+The Azure SDK only streams IOBase request bodies (any other bytes-like value
+is JSON-serialized), and BytesIO(memoryview) copies the whole buffer first.
+BufferReader hands the HTTP transport slices of the original buffer instead,
+so a memory-mapped input is uploaded straight from the page cache.
+
+Usage:
+    body = BufferReader(memoryview(mm))
+"""
+
+import io
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable binary stream over a buffer; one cursor per reader."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        # Drop our export so the underlying mmap can be closed or collected
+        if not self.closed:
+            self._view.release()
+        super().close()
@@ -0,0 +1,158 @@
+"""
+di_cache
+--------
+Content-addressed cache for Document Intelligence and LLM results.
+
+DI keys are SHA-256(document content) + model id, so retries and duplicate
+uploads of the same file skip the multi-second analyze call. LLM keys are
+BLAKE2b(OCR text) + a namespace, so different files that OCR to the same
+text still skip the completion. Entries live in a diskcache directory (safe
+to share between worker processes) and expire after DI_CACHE_TTL seconds.
+The directory defaults to a private per-user location
+($XDG_CACHE_HOME or ~/.cache, under emp_verify/di) and is only opened on
+the first lookup or store, so importing an adaptor writes nothing.
+Set EMP_VERIFY_CACHE=0 or DI_CACHE_DIR="" to disable caching.
+
+Usage:
+    @cached_by_content("prebuilt-read")
+    def extract_read_text(file_or_bytes) -> str: ...
+
+    @cached_by_text("llm:gpt-4o")
+    def extract_llm_fields(text) -> dict: ...
+"""
+
+import os
+import hashlib
+import inspect
+import threading
+from functools import wraps
+
+import orjson
+from diskcache import Cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMP_VERIFY_CACHE = os.getenv("EMP_VERIFY_CACHE", "1") == "1"
+DI_CACHE_DIR = os.getenv(
+    "DI_CACHE_DIR",
+    os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "emp_verify", "di"),
+)
+DI_CACHE_TTL = int(os.getenv("DI_CACHE_TTL", str(7 * 24 * 3600)))
+
+_cache: Cache | None = None
+_cache_lock = threading.Lock()
+
+
+def _open_cache() -> Cache | None:
+    """The shared Cache, opened on first use; None when caching is off."""
+    global _cache
+    if _cache is None and EMP_VERIFY_CACHE and DI_CACHE_DIR:
+        with _cache_lock:
+            if _cache is None:
+                # Entries hold employee names, EINs and pay: owner-only directory
+                os.makedirs(DI_CACHE_DIR, mode=0o700, exist_ok=True)
+                _cache = Cache(DI_CACHE_DIR)
+    return _cache
+
+
+def content_key(document, model_id: str) -> str | None:
+    """
+    Cache key for one document analyzed by one model. `document` is bytes or
+    a seekable binary stream (hashed in chunks, then rewound); returns None
+    for streams that cannot be rewound, which are never cached.
+    """
+    if isinstance(document, (bytes, bytearray, memoryview)):
+        return f"{hashlib.sha256(document).hexdigest()}:{model_id}"
+    if not document.seekable():
+        return None
+    h = hashlib.sha256()
+    document.seek(0)
+    for chunk in iter(lambda: document.read(1 << 16), b""):
+        h.update(chunk)
+    document.seek(0)
+    return f"{h.hexdigest()}:{model_id}"
+
+
+def text_key(text: str, namespace: str) -> str:
+    """Cache key for one text fed to one LLM extraction (see cached_by_text)."""
+    return f"{hashlib.blake2b(text.encode(), digest_size=16).hexdigest()}:{namespace}"
+
+
+def _get(key: str):
+    cache = _open_cache()
+    hit = None if cache is None else cache.get(key)
+    return None if hit is None else orjson.loads(hit)
+
+
+def _put(key: str, value) -> None:
+    cache = _open_cache()
+    if cache is not None:
+        cache.set(key, orjson.dumps(value), expire=DI_CACHE_TTL)
+
+
+def lookup(key: str | None):
+    """Cached value for `key`, or None on a miss, a None key, or caching off."""
+    return None if key is None else _get(key)
+
+
+def store(key: str | None, value) -> None:
+    """Cache `value` under `key`; a no-op for a None key or caching off."""
+    if key is not None:
+        _put(key, value)
+
+
+def _memoize(key_fn, cacheable=None):
+    """
+    Decorator factory shared by cached_by_content / cached_by_text:
+    `key_fn(first_arg)` returns the cache key, or None to bypass the cache.
+    Results for which `cacheable(value)` is false are returned but not stored.
+    """
+    def decorator(fn):
+        if not (EMP_VERIFY_CACHE and DI_CACHE_DIR):
+            return fn
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(first, *args, **kwargs):
+                key = key_fn(first)
+                hit = _get(key) if key else None
+                if hit is not None:
+                    return hit
+                value = await fn(first, *args, **kwargs)
+                if key and (cacheable is None or cacheable(value)):
+                    _put(key, value)
+                return value
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(first, *args, **kwargs):
+            key = key_fn(first)
+            hit = _get(key) if key else None
+            if hit is not None:
+                return hit
+            value = fn(first, *args, **kwargs)
+            if key and (cacheable is None or cacheable(value)):
+                _put(key, value)
+            return value
+        return wrapper
+
+    return decorator
+
+
+def cached_by_content(model_id: str):
+    """
+    Decorate an extractor whose first argument is the document and
+    whose return value is JSON-serializable. Works for sync and async
+    extractors; hits return a fresh copy, so callers may mutate the result.
+    """
+    return _memoize(lambda document: content_key(document, model_id))
+
+
+def cached_by_text(namespace: str, cacheable=None):
+    """
+    Like cached_by_content, for extractors whose first argument is text.
+    `namespace` should change whenever the model or prompt does; pass
+    `cacheable` to keep failed results (e.g. unparsed LLM output) out.
+    """
+    return _memoize(lambda text: text_key(text, namespace), cacheable)
@@ -0,0 +1,175 @@
+"""
+di_common
+---------
+Document Intelligence request plumbing shared by the adaptors: body wrapping,
+the SDK's body keyword, transient-error retries, the analyze wrappers and
+batch-result collection, plus the aio client factory and connection warmup.
+Each adaptor keeps its own client; these helpers take it as an argument.
+
+Usage:
+    poller = begin_analyze(di_client, "prebuilt-read", file_or_bytes, polling=True)
+"""
+
+import os
+import inspect
+from io import BytesIO
+from typing import IO, Callable, Union
+from urllib.parse import urlsplit, unquote
+
+import httpx
+import orjson
+
+from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError, ServiceRequestError
+from azure.core.rest import HttpRequest
+from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
+from azure.ai.documentintelligence.models import AnalyzeResult
+from dotenv import load_dotenv
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from buffer_io import BufferReader
+
+load_dotenv()
+
+# Seconds between LRO status polls when the service sends no Retry-After.
+# Passing polling_interval is enough, no custom LROBasePolling is needed:
+# begin_analyze_document pops it into LROBasePolling(lro_delay=...) (also for
+# the batch call), and LROBasePolling._extract_delay still prefers a
+# Retry-After header over it. A hand-built LROBasePolling would also have to
+# repeat the SDK's path_format_arguments, or the poll URLs lose the endpoint.
+DI_POLL_INTERVAL = float(os.getenv("DI_POLL_INTERVAL", "1"))
+
+# SDK versions disagree on the request-body keyword ("document" vs "body");
+# resolve it once at import instead of retrying on TypeError every call.
+BODY_ARG = (
+    "document"
+    if "document" in inspect.signature(DocumentIntelligenceClient.begin_analyze_document).parameters
+    else "body"
+)
+
+
+def async_client(endpoint: str, key: str) -> AsyncDocumentIntelligenceClient:
+    """
+    Fresh aio client for one call. Its HTTP session is bound to the event
+    loop that opened it, and process_paystub runs a fresh loop each time,
+    so aio clients are created per call rather than shared.
+    """
+    return AsyncDocumentIntelligenceClient(endpoint=endpoint, credential=AzureKeyCredential(key))
+
+
+def warmup(client: DocumentIntelligenceClient) -> None:
+    """
+    Open the client's HTTPS connection (TLS handshake) ahead of the first
+    analyze call. Best effort: errors are ignored and surface on the real call.
+    """
+    try:
+        client.send_request(HttpRequest(
+            "GET", "/info",
+            params={"api-version": client._config.api_version},
+        ), retry_total=0)
+    except Exception:
+        pass
+
+
+def is_transient(exc: BaseException) -> bool:
+    """429 / 5xx responses and connection failures are worth retrying."""
+    if isinstance(exc, HttpResponseError):
+        return exc.status_code == 429 or (exc.status_code or 0) >= 500
+    return isinstance(exc, ServiceRequestError)
+
+
+def retry_transient(*extra: type):
+    """
+    Up to 3 attempts with exponential backoff; the last error is re-raised
+    as-is. `extra` adds exception types (e.g. OpenAI rate limits) to retry.
+    """
+    return retry(
+        retry=retry_if_exception(lambda exc: is_transient(exc) or isinstance(exc, extra)),
+        wait=wait_exponential(min=1, max=30),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+
+
+def as_body(file_or_bytes: Union[bytes, memoryview, IO[bytes]]) -> IO[bytes]:
+    """
+    Wrap raw bytes in BytesIO and memoryviews (e.g. of an mmap'd input) in a
+    zero-copy BufferReader; open binary files are streamed as-is, rewound
+    first when seekable (pipes are sent from wherever they are).
+    """
+    if isinstance(file_or_bytes, (bytes, bytearray)):
+        return BytesIO(file_or_bytes)
+    if isinstance(file_or_bytes, memoryview):
+        return BufferReader(file_or_bytes)
+    if file_or_bytes.seekable():
+        file_or_bytes.seek(0)
+    return file_or_bytes
+
+
+def _replayable(file_or_bytes) -> bool:
+    """A body can be resent on retry if it is in memory or can be rewound."""
+    return isinstance(file_or_bytes, (bytes, bytearray, memoryview)) or file_or_bytes.seekable()
+
+
+def _begin_analyze_once(client, model_id: str, file_or_bytes, **kwargs):
+    kwargs.setdefault("polling_interval", DI_POLL_INTERVAL)
+    kwargs.setdefault("content_type", "application/octet-stream")
+    return client.begin_analyze_document(
+        model_id=model_id,
+        **{BODY_ARG: as_body(file_or_bytes)},
+        **kwargs,
+    )
+
+
+_begin_analyze_retried = retry_transient()(_begin_analyze_once)
+
+
+def begin_analyze(client, model_id: str, file_or_bytes: Union[bytes, memoryview, IO[bytes]],
+                  **kwargs):
+    """
+    client.begin_analyze_document with the body keyword, poll interval and
+    content type resolved. The SDK only infers application/octet-stream for
+    bytes / BytesIO / BufferedReader bodies; any other stream (e.g. the
+    BufferReader over an mmap'd input) would go out as application/json.
+    Transient errors are retried only for bodies that can be replayed; a
+    non-seekable stream is consumed by the first attempt, so it is sent once.
+    """
+    if _replayable(file_or_bytes):
+        return _begin_analyze_retried(client, model_id, file_or_bytes, **kwargs)
+    return _begin_analyze_once(client, model_id, file_or_bytes, **kwargs)
+
+
+@retry_transient()
+async def begin_analyze_async(client, model_id: str, file_bytes: bytes, **kwargs):
+    """Async twin of begin_analyze"""
+    kwargs.setdefault("polling_interval", DI_POLL_INTERVAL)
+    kwargs.setdefault("content_type", "application/octet-stream")
+    return await client.begin_analyze_document(
+        model_id=model_id,
+        **{BODY_ARG: BytesIO(file_bytes)},
+        **kwargs,
+    )
+
+
+def collect_batch(batch, result_container_url: str, to_fields: Callable) -> dict:
+    """
+    Map each source blob name (path inside the source container) to
+    `to_fields(result)`, downloading the per-document result JSON the service
+    wrote into the result container. Failed documents map to {"error": ...}.
+    """
+    sas = urlsplit(result_container_url).query
+    out = {}
+    with httpx.Client(timeout=60) as http:
+        for detail in batch.details or []:
+            name = unquote(urlsplit(detail.source_url).path).split("/", 2)[-1]
+            if detail.status != "succeeded" or not detail.result_url:
+                out[name] = {"error": detail.error.message if detail.error else detail.status}
+                continue
+            url = detail.result_url
+            if sas and not urlsplit(url).query:
+                url = f"{url}?{sas}"
+            resp = http.get(url)
+            resp.raise_for_status()
+            out[name] = to_fields(AnalyzeResult(orjson.loads(resp.content)["analyzeResult"]))
+    return out
@@ -1,9 +1,21 @@
 # ev_adaptor.py
-import os, sys, json
-from io import BytesIO
+import os, sys
+from functools import partial
+from typing import IO, Callable, Union
+import orjson
 from dotenv import load_dotenv
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.ai.documentintelligence.models import (
+    AnalyzeBatchDocumentsRequest,
+    AzureBlobContentSource,
+)
+
+from di_common import (
+    DI_POLL_INTERVAL, async_client, begin_analyze, begin_analyze_async, collect_batch,
+    warmup as di_warmup,
+)
+from di_cache import cached_by_content, content_key, lookup, store
 
 # ---------------- Env & client ----------------
 load_dotenv()
@@ -13,43 +25,21 @@ AZURE_DI_KEY = os.getenv("AZURE_DI_KEY")
 EV_MODEL_ID = os.getenv("EV_MODEL_ID", "EmploymentVerificationExtractor4")
 
 if not AZURE_DI_ENDPOINT or not AZURE_DI_KEY:
-    print("❌ Missing AZURE_DI_ENDPOINT or AZURE_DI_KEY in environment.")
-    sys.exit(1)
+    sys.exit("❌ Missing AZURE_DI_ENDPOINT or AZURE_DI_KEY in environment.")
 
 di_client = DocumentIntelligenceClient(
     endpoint=AZURE_DI_ENDPOINT,
     credential=AzureKeyCredential(AZURE_DI_KEY),
 )
 
-def _begin_analyze(model_id: str, file_bytes: bytes, **kwargs):
-    """Wrapper for body/document arg differences"""
-    try:
-        return di_client.begin_analyze_document(
-            model_id=model_id,
-            document=BytesIO(file_bytes),
-            **kwargs,
-        )
-    except TypeError:
-        return di_client.begin_analyze_document(
-            model_id=model_id,
-            body=BytesIO(file_bytes),
-            **kwargs,
-        )
+_async_di_client = partial(async_client, AZURE_DI_ENDPOINT, AZURE_DI_KEY)
 
-def extract_ev_structured(file_bytes: bytes) -> dict:
-    """
-    Just extract fields from EV custom model.
-    Returns JSON like paystub_adaptor: 
-    { field: {"value": ..., "confidence": ...}, ... }
-    """
-    poller = _begin_analyze(
-        model_id=EV_MODEL_ID,
-        file_bytes=file_bytes,
-        content_type="application/octet-stream",
-        polling=True,
-    )
-    result = poller.result()
+def warmup() -> None:
+    """Open the DI connection ahead of the first analyze call (best effort)."""
+    di_warmup(di_client)
 
+def _ev_fields(result) -> dict:
+    """Flatten the first analyzed document into { field: {"value", "confidence"} }"""
     doc = result.documents[0] if getattr(result, "documents", []) else None
     out = {}
 
@@ -63,15 +53,81 @@ def extract_ev_structured(file_bytes: bytes) -> dict:
 
     return out
 
+def begin_ev_structured(file_or_bytes: Union[bytes, IO[bytes]]) -> Callable[[], dict]:
+    """
+    Submit the EV custom model without waiting: the SDK polls the LRO on a
+    background thread. Returns a zero-argument callable that blocks for the
+    same fields extract_ev_structured returns (content cache included).
+    """
+    key = content_key(file_or_bytes, EV_MODEL_ID)
+    hit = lookup(key)
+    if hit is not None:
+        return lambda: hit
+    poller = begin_analyze(
+        di_client,
+        EV_MODEL_ID,
+        file_or_bytes,
+        content_type="application/octet-stream",
+        polling=True,
+    )
+
+    def finish() -> dict:
+        fields = _ev_fields(poller.result())
+        store(key, fields)
+        return fields
+    return finish
+
+def extract_ev_structured(file_or_bytes: Union[bytes, IO[bytes]]) -> dict:
+    """
+    Just extract fields from EV custom model.
+    Accepts raw bytes or an open binary file (streamed, not read into memory).
+    Returns JSON like paystub_adaptor: 
+    { field: {"value": ..., "confidence": ...}, ... }
+    """
+    return begin_ev_structured(file_or_bytes)()
+
+@cached_by_content(EV_MODEL_ID)
+async def extract_ev_structured_async(file_bytes: bytes) -> dict:
+    """Same as extract_ev_structured, but awaitable so it can overlap other DI calls."""
+    async with _async_di_client() as client:
+        poller = await begin_analyze_async(
+            client,
+            EV_MODEL_ID,
+            file_bytes,
+            content_type="application/octet-stream",
+            polling=True,
+        )
+        result = await poller.result()
+    return _ev_fields(result)
+
+def extract_ev_batch(source_container_url: str, result_container_url: str,
+                     prefix: str | None = None) -> dict:
+    """
+    Run the EV custom model over every document under `prefix` in a blob
+    container as one batch operation.
+    Both URLs need SAS tokens (read+list source, read+write results).
+    Returns { blob_name: { field: {"value": ..., "confidence": ...} } }.
+    """
+    poller = di_client.begin_analyze_batch_documents(
+        model_id=EV_MODEL_ID,
+        body=AnalyzeBatchDocumentsRequest(
+            azure_blob_source=AzureBlobContentSource(
+                container_url=source_container_url,
+                prefix=prefix,
+            ),
+            result_container_url=result_container_url,
+        ),
+        polling_interval=DI_POLL_INTERVAL,
+    )
+    return collect_batch(poller.result(), result_container_url, _ev_fields)
+
 # ---------------- CLI ----------------
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python ev_adaptor.py <path_to_ev_document>")
-        sys.exit(1)
+        sys.exit("Usage: python ev_adaptor.py <path_to_ev_document>")
 
     file_path = sys.argv[1]
     with open(file_path, "rb") as f:
-        file_bytes = f.read()
-
-    fields = extract_ev_structured(file_bytes)
-    print(json.dumps(fields, indent=2))
+        fields = extract_ev_structured(f)
+    # orjson emits UTF-8; write the bytes so a non-UTF-8 console can't choke on names
+    sys.stdout.buffer.write(orjson.dumps(fields, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
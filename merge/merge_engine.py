@@ -6,92 +6,205 @@ unified JSON using hard source priority rules.
 
 Usage:
     merged = build_unified(paystub_raw_dict, ev_raw_dict)
+    merged = combine(prep_paystub(paystub_raw_dict), prep_ev(ev_raw_dict))
+    frame = normalize_paystub_batch([paystub_raw_dict, ...])   # bulk, needs pandas
 """
 
 from __future__ import annotations
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, TYPE_CHECKING
 
 from .rules import (
-    CANONICAL_FIELDS, PRIORITY,
+    RESOLVED_PRIORITY, DERIVED_FIELDS,
     PAYSTUB_FIELD_MAP, EV_FIELD_MAP
 )
 from normalize import paystub_fields as psn
 from normalize import ev_fields as evn
+from normalize.common import FieldRecord, parse_date, titlecase_job, to_float
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def _shape(value, confidence):
-    """Create a {value, confidence} record."""
-    return {"value": value, "confidence": confidence}
+
+def _shape(record: FieldRecord) -> Dict[str, Any]:
+    """Serialize a FieldRecord into the {value, confidence} JSON shape."""
+    return {"value": record.value, "confidence": record.confidence}
 
 
 # ---------- Normalization ----------
 
-def normalize_paystub(ps: Dict[str, Dict[str, Any]] | None) -> Dict[str, Dict[str, Any]]:
+# (raw key, canonical key, normalizer) — built once at import
+_PS_MAP = (
+    ("EmployeeName", "EmployeeName", psn.norm_employee_name_ps),
+    ("EmployerName", "EmployerName", psn.norm_employer_name_ps),
+    ("EmployerAddress", "EmployerAddress", psn.norm_employer_address_ps),
+    ("EIN", "EIN", psn.norm_ein_ps),
+    ("JobTitle", "JobTitle", psn.norm_job_title_ps),
+    ("PayDate", "PayDate", psn.norm_pay_date_ps),
+    ("CurrentPeriodGrossPay", "GrossAmount", psn.norm_gross_amount_ps),
+    ("TotalHoursWorked", "TotalHours", psn.norm_total_hours_ps),
+    ("PayPeriodStartDate", "PayPeriodStartDate", psn.norm_period_start_ps),
+    ("PayPeriodEndDate", "PayPeriodEndDate", psn.norm_period_end_ps),
+)
+
+_EV_MAP = (
+    ("EmployeeName", "EmployeeName", evn.norm_employee_name_ev),
+    ("CompanyName", "EmployerName", evn.norm_employer_name_ev),
+    ("Company Address", "EmployerAddress", evn.norm_employer_address_ev),
+    ("EIN", "EIN", evn.norm_ein_ev),
+    ("HireDate", "HireDate", evn.norm_hire_date_ev),
+    ("JobTitle", "JobTitle", evn.norm_job_title_ev),
+    ("AverageWorkingHours", "TotalHours", evn.norm_total_hours_ev),
+    ("EmplyomentEndDate", "LossOfEmploymentDate", evn.norm_lof_date_ev),
+    ("EmploymentEndDateReason", "LossOfEmploymentReason", evn.norm_lof_reason_ev),
+    ("FinalPayCheckDate", "DateOfLastPaycheck", evn.norm_last_paycheck_date_ev),
+)
+
+
+def normalize_paystub(ps: Dict[str, Dict[str, Any]] | None) -> Dict[str, FieldRecord]:
     """
     Map and clean paystub fields into canonical names.
     Input:  {"RawKey": {"value": ..., "confidence": ...}, ...}
-    Output: {"CanonicalKey": {"value": cleaned, "confidence": ...}, ...}
+    Output: {"CanonicalKey": FieldRecord(cleaned, confidence), ...}
     """
     ps = ps or {}
-    out: Dict[str, Dict[str, Any]] = {}
-
-    def take(raw_key, canon_key, fn):
+    out: Dict[str, FieldRecord] = {}
+    for raw_key, canon_key, fn in _PS_MAP:
         item = ps.get(raw_key)
-        if item is None or canon_key is None:
-            return
-        out[canon_key] = fn(item)
-
-    take("EmployeeName", "EmployeeName", psn.norm_employee_name_ps)
-    take("EmployerName", "EmployerName", psn.norm_employer_name_ps)
-    take("EmployerAddress", "EmployerAddress", psn.norm_employer_address_ps)
-    take("EIN", "EIN", psn.norm_ein_ps)
-    take("JobTitle", "JobTitle", psn.norm_job_title_ps)
-    take("PayDate", "PayDate", psn.norm_pay_date_ps)
-    take("CurrentPeriodGrossPay", "GrossAmount", psn.norm_gross_amount_ps)
-    take("TotalHoursWorked", "TotalHours", psn.norm_total_hours_ps)
-    take("PayPeriodStartDate", "PayPeriodStartDate", psn.norm_period_start_ps)
-    take("PayPeriodEndDate", "PayPeriodEndDate", psn.norm_period_end_ps)
-
+        if item is not None:
+            out[canon_key] = fn(item)
     return out
 
 
-def normalize_ev(ev: Dict[str, Dict[str, Any]] | None) -> Dict[str, Dict[str, Any]]:
+def normalize_ev(ev: Dict[str, Dict[str, Any]] | None) -> Dict[str, FieldRecord]:
     """
     Map and clean EV fields into canonical names.
     """
     ev = ev or {}
-    out: Dict[str, Dict[str, Any]] = {}
-
-    def take(raw_key, canon_key, fn):
+    out: Dict[str, FieldRecord] = {}
+    for raw_key, canon_key, fn in _EV_MAP:
         item = ev.get(raw_key)
-        if item is None or canon_key is None:
-            return
-        out[canon_key] = fn(item)
-
-    take("EmployeeName", "EmployeeName", evn.norm_employee_name_ev)
-    take("CompanyName", "EmployerName", evn.norm_employer_name_ev)
-    take("Company Address", "EmployerAddress", evn.norm_employer_address_ev)
-    take("EIN", "EIN", evn.norm_ein_ev)
-    take("HireDate", "HireDate", evn.norm_hire_date_ev)
-    take("JobTitle", "JobTitle", evn.norm_job_title_ev)
-    take("AverageWorkingHours", "TotalHours", evn.norm_total_hours_ev)
-    take("EmplyomentEndDate", "LossOfEmploymentDate", evn.norm_lof_date_ev)
-    take("EmploymentEndDateReason", "LossOfEmploymentReason", evn.norm_lof_reason_ev)
-    take("FinalPayCheckDate", "DateOfLastPaycheck", evn.norm_last_paycheck_date_ev)
+        if item is not None:
+            out[canon_key] = fn(item)
+    return out
+
+
+# ---------- Bulk normalization ----------
+
+# (raw key, canonical key, column kind) — mirrors normalize_paystub
+_PS_BATCH_COLUMNS = (
+    ("EmployeeName", "EmployeeName", "text"),
+    ("EmployerName", "EmployerName", "text"),
+    ("EmployerAddress", "EmployerAddress", "text"),
+    ("EIN", "EIN", "keep"),
+    ("JobTitle", "JobTitle", "title"),
+    ("PayDate", "PayDate", "date"),
+    ("CurrentPeriodGrossPay", "GrossAmount", "money"),
+    ("TotalHoursWorked", "TotalHours", "float"),
+    ("PayPeriodStartDate", "PayPeriodStartDate", "date"),
+    ("PayPeriodEndDate", "PayPeriodEndDate", "date"),
+)
+_DATE_FMTS = ("%m/%d/%Y", "%m-%d-%Y", "%Y-%m-%d", "%m/%d/%y", "%m-%d-%y", "%d-%b-%Y", "%d %b %Y")
+
+
+def _per_unique(col: "pd.Series", fn) -> "pd.Series":
+    """Run a scalar normalizer once per distinct non-null value of the column."""
+    uniq = {v: fn(v) for v in col.dropna().unique()}
+    return col.map(uniq)
+
+
+def _batch_text(col: "pd.Series") -> "pd.Series":
+    """squash_spaces over a column: falsy -> NaN, collapse whitespace, '' -> NaN."""
+    col = col.where(col.astype(bool) & col.notna())
+    col = col.where(col.isna(), col.astype(str))
+    out = col.str.split().str.join(" ")
+    return out.where(out != "")
+
+
+def _batch_date(col: "pd.Series") -> "pd.Series":
+    """parse_date over a column: known formats vectorized, leftovers via parse_date."""
+    import pandas as pd
 
+    txt = _batch_text(col)
+    txt = txt.where(txt.str.len() >= 6)
+    out = pd.Series(None, index=txt.index, dtype=object)
+    for fmt in _DATE_FMTS:
+        parsed = pd.to_datetime(txt, format=fmt, errors="coerce")
+        out = out.fillna(parsed.dt.strftime("%Y-%m-%d").astype(object))
+    rest = out.isna() & txt.notna()
+    if rest.any():
+        out[rest] = _per_unique(txt[rest], parse_date)
     return out
 
 
+def _batch_money(col: "pd.Series") -> "pd.Series":
+    """clean_money over a column."""
+    raw = col.where(col.astype(bool) & col.notna())
+    raw = raw.where(raw.isna(), raw.astype(str))
+    txt = _batch_text(raw).fillna(raw)
+    return txt.str.replace(r" ?([,.]) ?|(\$) ", r"\1\2", regex=True)
+
+
+def _batch_float(col: "pd.Series") -> "pd.Series":
+    """to_float over a column: numeric parse vectorized, word+number leftovers via to_float."""
+    import pandas as pd
+
+    out = pd.to_numeric(col, errors="coerce")
+    rest = out.isna() & col.notna()
+    if rest.any():
+        out[rest] = _per_unique(col[rest], to_float)
+    return out
+
+
+_BATCH_KINDS = {
+    "text": _batch_text,
+    # titlecase_job squashes spaces itself and maps whitespace-only to "", not None
+    "title": lambda col: _per_unique(col.where(col.astype(bool) & col.notna()), titlecase_job),
+    "date": _batch_date,
+    "money": _batch_money,
+    "float": _batch_float,
+    "keep": lambda col: col,
+}
+
+
+def normalize_paystub_batch(records: List[Dict[str, Dict[str, Any]] | None]) -> "pd.DataFrame":
+    """
+    Column-wise normalize_paystub for bulk runs: each canonical field is
+    cleaned once per column instead of once per document.
+    Returns one row per record with a column per canonical field plus
+    "<Field>_confidence"; fields absent from a record are NaN.
+    """
+    import pandas as pd
+
+    records = [r or {} for r in records]
+    raw_keys = [raw for raw, _, _ in _PS_BATCH_COLUMNS]
+    values = pd.DataFrame.from_records(
+        [{k: (r.get(k) or {}).get("value") for k in raw_keys} for r in records],
+        columns=raw_keys,
+    ).astype(object)
+    confs = pd.DataFrame.from_records(
+        [{k: (r.get(k) or {}).get("confidence") for k in raw_keys} for r in records],
+        columns=raw_keys,
+    )
+
+    out = {}
+    for raw, canon, kind in _PS_BATCH_COLUMNS:
+        out[canon] = _BATCH_KINDS[kind](values[raw])
+        out[f"{canon}_confidence"] = confs[raw]
+    return pd.DataFrame(out, index=values.index)
+
+
 # ---------- Derivations ----------
 
-def derive_pay_frequency(ps_norm: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]] | None:
+def derive_pay_frequency(ps_norm: Dict[str, FieldRecord]) -> Dict[str, FieldRecord] | None:
     """
     Compute PayFrequency from PayPeriodStartDate/PayPeriodEndDate (paystub only).
-    Returns {"PayFrequency": {"value": "...", "confidence": 100}} or None.
+    Returns {"PayFrequency": FieldRecord("...", 100.0)} or None.
     """
-    s = (ps_norm.get("PayPeriodStartDate") or {}).get("value")
-    e = (ps_norm.get("PayPeriodEndDate") or {}).get("value")
+    start = ps_norm.get("PayPeriodStartDate")
+    end = ps_norm.get("PayPeriodEndDate")
+    s = start.value if start is not None else None
+    e = end.value if end is not None else None
     if not s or not e:
         return None
     try:
@@ -110,52 +223,63 @@ def derive_pay_frequency(ps_norm: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[s
     else:
         val = "Monthly"
 
-    return {"PayFrequency": {"value": val, "confidence": 100.0}}
+    return {"PayFrequency": FieldRecord(val, 100.0)}
 
 
 # ---------- Merge ----------
 
-def merge_by_priority(ps_norm: Dict[str, Dict[str, Any]],
-                      ev_norm: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+def merge_by_priority(ps_norm: Dict[str, FieldRecord],
+                      ev_norm: Dict[str, FieldRecord]) -> Dict[str, FieldRecord]:
     """
     Apply hard source priority for each canonical field.
     """
-    final: Dict[str, Dict[str, Any]] = {}
+    final: Dict[str, FieldRecord] = {}
+    sources = (ps_norm, ev_norm)
 
-    for field in CANONICAL_FIELDS:
+    for field, source_idx in RESOLVED_PRIORITY.items():
         chosen = None
-        for src in PRIORITY.get(field, []):
-            if src == "paystub":
-                item = ps_norm.get(field)
-                if item and item.get("value") not in (None, ""):
-                    chosen = item
-                    break
-            elif src == "ev":
-                item = ev_norm.get(field)
-                if item and item.get("value") not in (None, ""):
-                    chosen = item
-                    break
-            elif src == "derived":
-                # compute later (outside loop) to keep simple
-                pass
-
-        final[field] = chosen or {"value": None, "confidence": None}
+        for i in source_idx:
+            item = sources[i].get(field)
+            if item is not None and item.value not in (None, ""):
+                chosen = item
+                break
+        final[field] = chosen or FieldRecord(None, None)
 
     # Fill derived fields after loop (e.g., PayFrequency)
-    if "PayFrequency" in CANONICAL_FIELDS and "derived" in PRIORITY.get("PayFrequency", []):
-        d = derive_pay_frequency(ps_norm)
-        if d and d.get("PayFrequency"):
-            final["PayFrequency"] = d["PayFrequency"]
+    for field in DERIVED_FIELDS:
+        if field == "PayFrequency":
+            d = derive_pay_frequency(ps_norm)
+            if d and d.get("PayFrequency"):
+                final["PayFrequency"] = d["PayFrequency"]
 
     return final
 
 
+def prep_paystub(paystub_raw: Dict[str, Dict[str, Any]] | None) -> Dict[str, FieldRecord]:
+    """Per-source stage for the paystub: normalize its raw output (None = absent)."""
+    return normalize_paystub(paystub_raw or {})
+
+
+def prep_ev(ev_raw: Dict[str, Dict[str, Any]] | None) -> Dict[str, FieldRecord]:
+    """Per-source stage for EV: normalize its raw output (None = absent)."""
+    return normalize_ev(ev_raw or {})
+
+
+def combine(ps_prepped: Dict[str, FieldRecord],
+            ev_prepped: Dict[str, FieldRecord]) -> Dict[str, Any]:
+    """Merge two prepped sources by priority and return unified JSON."""
+    merged = merge_by_priority(ps_prepped, ev_prepped)
+    return {
+        "status": "success",
+        "extracted_fields": {field: _shape(rec) for field, rec in merged.items()},
+    }
+
+
 def build_unified(paystub_raw: Dict[str, Dict[str, Any]] | None,
                   ev_raw: Dict[str, Dict[str, Any]] | None) -> Dict[str, Any]:
     """
     Entry point: normalize both sources, merge by priority, return unified JSON.
+    Callers that get the sources at different times can run prep_paystub /
+    prep_ev as each arrives and finish with combine().
     """
-    ps_norm = normalize_paystub(paystub_raw or {})
-    ev_norm = normalize_ev(ev_raw or {})
-    merged = merge_by_priority(ps_norm, ev_norm)
-    return {"status": "success", "extracted_fields": merged}
+    return combine(prep_paystub(paystub_raw), prep_ev(ev_raw))
@@ -5,11 +5,12 @@ Canonical field list, source priority, and source→canonical key maps.
 
 - Canonical fields are what the unified JSON will expose.
 - PRIORITY expresses hard preference (paystub wins where applicable).
+- RESOLVED_PRIORITY is PRIORITY pre-resolved to source indexes for the merge loop.
 - *_FIELD_MAP translate raw extractor keys into canonical names.
 """
 
 # Final fields expected in the unified JSON
-CANONICAL_FIELDS = [
+CANONICAL_FIELDS = (
     "EmployeeName",
     "EmployerName",
     "EmployerAddress",
@@ -25,30 +26,48 @@ CANONICAL_FIELDS = [
     "LossOfEmploymentDate",
     "LossOfEmploymentReason",
     "DateOfLastPaycheck",
-]
+)
+
+CANONICAL_FIELDS_SET = frozenset(CANONICAL_FIELDS)
 
 # Hard priority by field (no confidence-based arbitration)
 PRIORITY = {
     # Shared (paystub first)
-    "EmployeeName": ["paystub", "ev"],
-    "EmployerName": ["paystub", "ev"],
-    "EmployerAddress": ["paystub", "ev"],
-    "EIN": ["paystub", "ev"],
-    "JobTitle": ["paystub", "ev"],
-    "TotalHours": ["paystub", "ev"],
+    "EmployeeName": ("paystub", "ev"),
+    "EmployerName": ("paystub", "ev"),
+    "EmployerAddress": ("paystub", "ev"),
+    "EIN": ("paystub", "ev"),
+    "JobTitle": ("paystub", "ev"),
+    "TotalHours": ("paystub", "ev"),
 
     # Paystub-only
-    "PayDate": ["paystub"],
-    "GrossAmount": ["paystub"],                # from CurrentPeriodGrossPay
-    "PayPeriodStartDate": ["paystub"],
-    "PayPeriodEndDate": ["paystub"],
-    "PayFrequency": ["derived"],               # computed from paystub dates
+    "PayDate": ("paystub",),
+    "GrossAmount": ("paystub",),                # from CurrentPeriodGrossPay
+    "PayPeriodStartDate": ("paystub",),
+    "PayPeriodEndDate": ("paystub",),
+    "PayFrequency": ("derived",),               # computed from paystub dates
 
     # EV-only
-    "HireDate": ["ev"],
-    "LossOfEmploymentDate": ["ev"],
-    "LossOfEmploymentReason": ["ev"],
-    "DateOfLastPaycheck": ["ev"],
+    "HireDate": ("ev",),
+    "LossOfEmploymentDate": ("ev",),
+    "LossOfEmploymentReason": ("ev",),
+    "DateOfLastPaycheck": ("ev",),
+}
+
+# Fields computed after the merge loop rather than taken from a source
+DERIVED_FIELDS = frozenset(
+    field for field, srcs in PRIORITY.items()
+    if "derived" in srcs and field in CANONICAL_FIELDS_SET
+)
+
+# Position of each extracted source in the (ps_norm, ev_norm) pair merge_by_priority
+# walks. "derived" fields have no source; they are computed after the loop.
+SOURCE_INDEX = {"paystub": 0, "ev": 1}
+
+# field -> tuple of source indexes in priority order, in CANONICAL_FIELDS order
+RESOLVED_PRIORITY = {
+    field: tuple(SOURCE_INDEX[src] for src in PRIORITY.get(field, ()) if src in SOURCE_INDEX)
+    for field in CANONICAL_FIELDS
 }
 
 # Map raw paystub keys to canonical names
@@ -7,17 +7,55 @@ All helpers are pure (no I/O) and should never raise on bad input.
 
 from __future__ import annotations
 import re
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from typing import Any
 
 _MONEY_RX = re.compile(r"[^\d.,-]")
 _ONLY_DIGITS = re.compile(r"\D+")
+# One pass over OCR spacing in amounts: " , " / " . " -> "," / "." and "$ " -> "$"
+_CLEAN_MONEY_RX = re.compile(r" ?([,.]) ?|(\$) ")
+
+# Date formats in priority order, each gated by a regex of the shapes
+# strptime could accept, so non-matching formats are skipped without raising.
+_ISO_DATE_RX = re.compile(r"\d{4}-\d{2}-\d{2}")
+_DATE_FORMATS = (
+    (re.compile(r"\d{1,2}/\d{1,2}/\d{4}"), "%m/%d/%Y"),
+    (re.compile(r"\d{1,2}-\d{1,2}-\d{4}"), "%m-%d-%Y"),
+    (re.compile(r"\d{4}-\d{1,2}-\d{1,2}"), "%Y-%m-%d"),
+    (re.compile(r"\d{1,2}/\d{1,2}/\d{2}"), "%m/%d/%y"),
+    (re.compile(r"\d{1,2}-\d{1,2}-\d{2}"), "%m-%d-%y"),
+    (re.compile(r"\d{1,2}-[A-Za-z]{3}-\d{4}"), "%d-%b-%Y"),
+    (re.compile(r"\d{1,2} [A-Za-z]{3} \d{4}"), "%d %b %Y"),
+)
+
+
+@dataclass(slots=True)
+class FieldRecord:
+    """
+    Normalized {value, confidence} pair used between normalization and merge.
+    Slotted to keep per-field memory small in bulk runs; converted back to a
+    plain dict only when the unified JSON is built.
+    """
+    value: Any
+    confidence: float | None
 
 
+# Helpers below are memoized: the same employer names, addresses, titles and
+# amounts repeat across a batch of documents. Public wrappers coerce to str
+# first so unhashable input still never raises.
+
 def squash_spaces(s: str | None) -> str | None:
     """Collapse extra spaces/newlines and trim. Returns None if empty."""
     if not s:
         return None
-    out = " ".join(str(s).split())
+    return _squash_text(str(s))
+
+
+@lru_cache(maxsize=2048)
+def _squash_text(s: str) -> str | None:
+    out = " ".join(s.split())
     return out or None
 
 
@@ -30,14 +68,18 @@ def clean_money(s: str | None) -> str | None:
     """
     if not s:
         return None
+    return _clean_money_text(str(s))
+
+
+@lru_cache(maxsize=2048)
+def _clean_money_text(s: str) -> str:
     s = squash_spaces(s) or s
     # join separated thousands and decimals like "3, 461. 54" -> "3,461.54"
-    s = s.replace(", ", ",").replace(" .", ".").replace(". ", ".").replace(" ,", ",")
-    # ensure "$ " -> "$"
-    s = s.replace("$ ", "$")
-    return s
+    # and ensure "$ " -> "$"
+    return _CLEAN_MONEY_RX.sub(r"\1\2", s)
 
 
+@lru_cache(maxsize=2048)
 def money_to_float(s: str | None) -> float | None:
     """Extract a numeric float from a currency string. Returns None if fails."""
     if not s:
@@ -76,17 +118,27 @@ def parse_date(s: str | None) -> str | None:
     """
     if not s:
         return None
-    txt = squash_spaces(str(s))
+    return _parse_date_text(str(s))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_text(s: str) -> str | None:
+    """parse_date body; cached because the same dates repeat across records."""
+    txt = squash_spaces(s)
     if not txt or len(txt) < 6:   # crude guard against things like "11"
         return None
 
     # Try a few common formats first
-    fmts = ["%m/%d/%Y", "%m-%d-%Y", "%Y-%m-%d", "%m/%d/%y", "%m-%d-%y", "%d-%b-%Y", "%d %b %Y"]
-    for f in fmts:
+    for rx, f in _DATE_FORMATS:
+        if not rx.fullmatch(txt):
+            continue
         try:
-            dt = datetime.strptime(txt, f)
+            if f == "%Y-%m-%d" and _ISO_DATE_RX.fullmatch(txt):
+                dt = datetime.fromisoformat(txt)
+            else:
+                dt = datetime.strptime(txt, f)
             return dt.strftime("%Y-%m-%d")
-        except Exception:
+        except ValueError:
             pass
 
     # Fallback: extract digits in order and attempt M/D/Y
@@ -101,10 +153,15 @@ def parse_date(s: str | None) -> str | None:
     return None
 
 
-def strip_prefix(s: str | None, prefixes: list[str]) -> str | None:
+def strip_prefix(s: str | None, prefixes: list[str] | tuple[str, ...]) -> str | None:
     """Remove any leading label among `prefixes` (case-insensitive)."""
     if not s:
         return None
+    return _strip_prefix_text(s, tuple(prefixes))
+
+
+@lru_cache(maxsize=2048)
+def _strip_prefix_text(s: str, prefixes: tuple[str, ...]) -> str:
     txt = s.lstrip()
     lowered = txt.lower()
     for p in prefixes:
@@ -119,6 +176,11 @@ def titlecase_job(s: str | None) -> str | None:
     """
     if not s:
         return None
+    return _titlecase_text(str(s))
+
+
+@lru_cache(maxsize=2048)
+def _titlecase_text(s: str) -> str:
     s = squash_spaces(s) or s
     parts = s.split()
     out = []
@@ -3,65 +3,89 @@ normalize.paystub_fields
 ------------------------
 Per-field normalizers for values coming from the paystub adapter.
 Each function receives a dict like {"value": <raw>, "confidence": <float>}
-and returns the same shape with cleaned value.
+and returns a FieldRecord with the cleaned value.
 
 These functions never raise. If cleaning fails, value becomes None (confidence kept).
+Callers only invoke them for present items, so `item` is never None.
+
+normalize_llm_into_struct folds LLM output into a raw paystub dict before any
+of the above run.
 """
 
-from .common import squash_spaces, clean_money, parse_date, to_float, titlecase_job
+import sys
+
+from .common import FieldRecord, squash_spaces, clean_money, parse_date, to_float, titlecase_job
 
 
-def _keep(shape):
-    """Internal helper: ensure dict with keys 'value' and 'confidence'."""
-    val = shape.get("value")
-    return {"value": val, "confidence": shape.get("confidence")}
+def _keep(shape) -> FieldRecord:
+    """Internal helper: carry 'value' and 'confidence' over unchanged."""
+    return FieldRecord(shape.get("value"), shape.get("confidence"))
 
 
-def norm_employee_name_ps(item: dict) -> dict:
-    v = squash_spaces((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
+def norm_employee_name_ps(item: dict) -> FieldRecord:
+    return FieldRecord(squash_spaces(item.get("value")), item.get("confidence"))
 
 
-def norm_employer_name_ps(item: dict) -> dict:
-    v = squash_spaces((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
+def norm_employer_name_ps(item: dict) -> FieldRecord:
+    return FieldRecord(squash_spaces(item.get("value")), item.get("confidence"))
 
 
-def norm_employer_address_ps(item: dict) -> dict:
-    v = squash_spaces((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
+def norm_employer_address_ps(item: dict) -> FieldRecord:
+    return FieldRecord(squash_spaces(item.get("value")), item.get("confidence"))
 
 
-def norm_ein_ps(item: dict) -> dict:
+def norm_ein_ps(item: dict) -> FieldRecord:
     # Some stubs don’t include EIN; just return as-is (merge will fallback to EV).
-    return _keep(item or {})
+    return _keep(item)
+
+
+def norm_job_title_ps(item: dict) -> FieldRecord:
+    v = titlecase_job(item.get("value"))
+    return FieldRecord(v, item.get("confidence"))
+
+
+def norm_pay_date_ps(item: dict) -> FieldRecord:
+    v = parse_date(item.get("value"))
+    return FieldRecord(v, item.get("confidence"))
+
 
+def norm_gross_amount_ps(item: dict) -> FieldRecord:
+    v = clean_money(item.get("value"))
+    return FieldRecord(v, item.get("confidence"))
 
-def norm_job_title_ps(item: dict) -> dict:
-    v = titlecase_job((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
 
+def norm_total_hours_ps(item: dict) -> FieldRecord:
+    v = to_float(item.get("value"))
+    return FieldRecord(v, item.get("confidence"))
 
-def norm_pay_date_ps(item: dict) -> dict:
-    v = parse_date((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
 
+def norm_period_start_ps(item: dict) -> FieldRecord:
+    v = parse_date(item.get("value"))
+    return FieldRecord(v, item.get("confidence"))
 
-def norm_gross_amount_ps(item: dict) -> dict:
-    v = clean_money((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
 
+def norm_period_end_ps(item: dict) -> FieldRecord:
+    v = parse_date(item.get("value"))
+    return FieldRecord(v, item.get("confidence"))
 
-def norm_total_hours_ps(item: dict) -> dict:
-    v = to_float((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
 
+# ---------- LLM output ----------
 
-def norm_period_start_ps(item: dict) -> dict:
-    v = parse_date((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
+# Confidence given to bare LLM values that carry none of their own
+_LLM_DEFAULT_CONF = 80.0
 
 
-def norm_period_end_ps(item: dict) -> dict:
-    v = parse_date((item or {}).get("value"))
-    return {"value": v, "confidence": item.get("confidence")}
+def normalize_llm_into_struct(ps_struct: dict, llm) -> dict:
+    """
+    Fold LLM fields into a raw paystub dict (in place; also returned).
+    Values already shaped {"value", "confidence"} pass through, bare values
+    get _LLM_DEFAULT_CONF, and keys are interned so they share identity with
+    the schema names. A non-dict `llm` (e.g. a failed parse) adds nothing.
+    """
+    if isinstance(llm, dict):
+        ps_struct.update({
+            sys.intern(k): v if isinstance(v, dict) and "value" in v
+            else {"value": v, "confidence": _LLM_DEFAULT_CONF}
+            for k, v in llm.items()
+        })
+    return ps_struct
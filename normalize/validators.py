@@ -5,10 +5,12 @@ Optional sanity checks used by normalizers.
 """
 
 import re
+from functools import lru_cache
 
 _EIN_RX = re.compile(r"^\d{6}$")
 
 
+@lru_cache(maxsize=2048)
 def is_valid_ein(value: str | None) -> bool:
     """Return True when value is exactly 6 digits."""
     if not value:
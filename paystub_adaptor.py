@@ -1,14 +1,34 @@
-import os, json, sys
-from io import BytesIO
+import os, sys
+import hashlib
+import time
+import asyncio
+import logging
+from contextlib import nullcontext
+from functools import partial
+from typing import IO, Callable, Union
+import orjson
 from dotenv import load_dotenv
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import DocumentAnalysisFeature
-from openai import AzureOpenAI
+from azure.ai.documentintelligence.models import (
+    DocumentAnalysisFeature,
+    AnalyzeBatchDocumentsRequest,
+    AzureBlobContentSource,
+)
+from openai import AzureOpenAI, AsyncAzureOpenAI, RateLimitError, APIConnectionError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from di_common import (
+    DI_POLL_INTERVAL, async_client, begin_analyze as di_begin_analyze, begin_analyze_async,
+    collect_batch, retry_transient, warmup as di_warmup,
+)
+from di_cache import cached_by_content, cached_by_text, content_key, lookup, store
 
 # ---------------- Config ----------------
 load_dotenv()
 
+log = logging.getLogger("paystub_adaptor")
+
 AZURE_DI_ENDPOINT = os.getenv("AZURE_DI_ENDPOINT")
 AZURE_DI_KEY = os.getenv("AZURE_DI_KEY")
 
@@ -16,6 +36,8 @@ AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
 AZURE_OPENAI_KEY = os.getenv("AZURE_OPENAI_KEY")
 AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
 AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+# Max in-flight chat completions when extracting many pay stubs at once
+AZURE_OPENAI_MAX_CONCURRENCY = int(os.getenv("AZURE_OPENAI_MAX_CONCURRENCY", "10"))
 
 # ---------------- Clients ----------------
 di_client = DocumentIntelligenceClient(
@@ -29,31 +51,37 @@ aoai_client = AzureOpenAI(
     azure_endpoint=AZURE_OPENAI_ENDPOINT,
 )
 
+_async_di_client = partial(async_client, AZURE_DI_ENDPOINT, AZURE_DI_KEY)
+
+# Per call, like di_common.async_client: the session is bound to its event loop
+def _async_aoai_client() -> AsyncAzureOpenAI:
+    return AsyncAzureOpenAI(
+        api_key=AZURE_OPENAI_KEY,
+        api_version=AZURE_OPENAI_API_VERSION,
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+    )
+
 # ---------------- Helpers ----------------
-def begin_analyze(model_id: str, file_bytes: bytes, **kwargs):
-    """DI client wrapper to work with body/document arg differences"""
+# DI 429/5xx and connection failures, plus OpenAI rate limits / connection errors
+_retry_transient = retry_transient(RateLimitError, APIConnectionError)
+
+def begin_analyze(model_id: str, file_or_bytes: Union[bytes, IO[bytes]], **kwargs):
+    """di_common.begin_analyze on this adaptor's client"""
+    return di_begin_analyze(di_client, model_id, file_or_bytes, **kwargs)
+
+def warmup() -> None:
+    """
+    Open the DI and Azure OpenAI HTTPS connections (TLS handshakes) ahead of
+    the first real calls. Best effort: errors are ignored and surface on the
+    real call.
+    """
+    di_warmup(di_client)
     try:
-        return di_client.begin_analyze_document(
-            model_id=model_id,
-            document=BytesIO(file_bytes),
-            **kwargs
-        )
-    except TypeError:
-        return di_client.begin_analyze_document(
-            model_id=model_id,
-            body=BytesIO(file_bytes),
-            **kwargs
-        )
+        aoai_client.with_options(max_retries=0, timeout=10).models.list()
+    except Exception:
+        pass
 
-def extract_paystub_structured(file_bytes: bytes):
-    poller = begin_analyze(
-        "prebuilt-payStub.us",
-        file_bytes,
-        content_type="application/octet-stream",
-        features=[DocumentAnalysisFeature.QUERY_FIELDS],
-        polling=True,
-    )
-    result = poller.result()
+def _paystub_fields(result) -> dict:
     doc = result.documents[0] if getattr(result, "documents", []) else None
     out = {}
     if doc:
@@ -64,11 +92,85 @@ def extract_paystub_structured(file_bytes: bytes):
             }
     return out
 
-def extract_read_text(file_bytes: bytes) -> str:
-    poller = begin_analyze("prebuilt-read", file_bytes, polling=True)
-    result = poller.result()
+def _read_text(result) -> str:
     return "\n".join([ln.content for pg in result.pages for ln in pg.lines])
 
+def begin_paystub_structured(file_or_bytes: Union[bytes, IO[bytes]]) -> Callable[[], dict]:
+    """
+    Submit prebuilt-payStub.us without waiting: the SDK polls the LRO on a
+    background thread. Returns a zero-argument callable that blocks for the
+    same fields extract_paystub_structured returns (content cache included).
+    """
+    key = content_key(file_or_bytes, "prebuilt-payStub.us")
+    hit = lookup(key)
+    if hit is not None:
+        return lambda: hit
+    poller = begin_analyze(
+        "prebuilt-payStub.us",
+        file_or_bytes,
+        content_type="application/octet-stream",
+        features=[DocumentAnalysisFeature.QUERY_FIELDS],
+        polling=True,
+    )
+
+    def finish() -> dict:
+        fields = _paystub_fields(poller.result())
+        store(key, fields)
+        return fields
+    return finish
+
+def extract_paystub_structured(file_or_bytes: Union[bytes, IO[bytes]]):
+    return begin_paystub_structured(file_or_bytes)()
+
+@cached_by_content("prebuilt-read")
+def extract_read_text(file_or_bytes: Union[bytes, IO[bytes]]) -> str:
+    poller = begin_analyze("prebuilt-read", file_or_bytes, polling=True)
+    return _read_text(poller.result())
+
+@cached_by_content("prebuilt-payStub.us")
+async def extract_paystub_structured_async(file_bytes: bytes):
+    async with _async_di_client() as client:
+        poller = await begin_analyze_async(
+            client,
+            "prebuilt-payStub.us",
+            file_bytes,
+            content_type="application/octet-stream",
+            features=[DocumentAnalysisFeature.QUERY_FIELDS],
+            polling=True,
+        )
+        result = await poller.result()
+    return _paystub_fields(result)
+
+@cached_by_content("prebuilt-read")
+async def extract_read_text_async(file_bytes: bytes) -> str:
+    async with _async_di_client() as client:
+        poller = await begin_analyze_async(client, "prebuilt-read", file_bytes, polling=True)
+        result = await poller.result()
+    return _read_text(result)
+
+def extract_paystub_batch(source_container_url: str, result_container_url: str,
+                          prefix: str | None = None) -> dict:
+    """
+    Analyze every paystub under `prefix` in a blob container with a single
+    batch operation instead of one LRO per document.
+    Both URLs need SAS tokens: read+list on the source container,
+    read+write on the result container.
+    Returns { blob_name: { field: {"value", "confidence"} } }.
+    """
+    poller = di_client.begin_analyze_batch_documents(
+        model_id="prebuilt-payStub.us",
+        body=AnalyzeBatchDocumentsRequest(
+            azure_blob_source=AzureBlobContentSource(
+                container_url=source_container_url,
+                prefix=prefix,
+            ),
+            result_container_url=result_container_url,
+        ),
+        features=[DocumentAnalysisFeature.QUERY_FIELDS],
+        polling_interval=DI_POLL_INTERVAL,
+    )
+    return collect_batch(poller.result(), result_container_url, _paystub_fields)
+
 # --- LLM Prompt ---
 EXTRACTION_PROMPT = """
 You are a payroll document expert. From the following pay stub text, extract these fields:
@@ -102,17 +204,28 @@ JSON:
 """
 
 
-def extract_llm_fields(text: str):
+# Cached completions are invalidated by a deployment or prompt change
+_LLM_CACHE_NS = (
+    f"llm:{AZURE_OPENAI_DEPLOYMENT}:"
+    f"{hashlib.blake2b(EXTRACTION_PROMPT.encode(), digest_size=4).hexdigest()}"
+)
+
+
+def _llm_cacheable(fields) -> bool:
+    """Unparsed completions (truncated or empty streams) are retried next time, not cached."""
+    return not (isinstance(fields, dict) and "raw_response" in fields)
+
+
+def _llm_messages(text: str) -> list:
     prompt = EXTRACTION_PROMPT.format(text=text[:2000])
-    resp = aoai_client.chat.completions.create(
-        model=AZURE_OPENAI_DEPLOYMENT,
-        messages=[
-            {"role": "system", "content": "Extract fields in JSON only"},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.0,
-    )
-    raw = resp.choices[0].message.content.strip()
+    return [
+        {"role": "system", "content": "Extract fields in JSON only"},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_llm_json(raw: str):
+    raw = raw.strip()
             # 👇 Debug: print the entire raw response from LLM
     #print("========== RAW LLM RESPONSE ==========")
     #print(raw)
@@ -124,21 +237,213 @@ def extract_llm_fields(text: str):
             raw = raw[4:].strip()     # drop "json" label
 
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
-        print("⚠️ Could not parse LLM JSON, returning raw text instead")
+        parsed = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        log.warning("⚠️ Could not parse LLM JSON, returning raw text instead")
         return {"raw_response": raw}
+    # Interned keys share identity with the schema names used downstream
+    if isinstance(parsed, dict):
+        return {sys.intern(k): v for k, v in parsed.items()}
+    return parsed
+
+
+class _JsonObjectEnd:
+    """
+    Fed streamed completion text; reports when the first top-level JSON
+    object closes (braces inside string literals are ignored), so the
+    stream can be dropped without waiting for trailing tokens.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, piece: str) -> bool:
+        for ch in piece:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"' and self.depth:
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    return True
+        return False
+
+
+def _delta_text(chunk) -> str | None:
+    # Azure sends choice-less chunks (content filter results) mid-stream
+    if not chunk.choices or not chunk.choices[0].delta:
+        return None
+    return chunk.choices[0].delta.content
+
+
+@cached_by_text(_LLM_CACHE_NS, cacheable=_llm_cacheable)
+@_retry_transient
+def extract_llm_fields(text: str):
+    parts, end = [], _JsonObjectEnd()
+    with aoai_client.chat.completions.create(
+        model=AZURE_OPENAI_DEPLOYMENT,
+        messages=_llm_messages(text),
+        temperature=0.0,
+        stream=True,
+    ) as stream:
+        for chunk in stream:
+            piece = _delta_text(chunk)
+            if piece:
+                parts.append(piece)
+                if end.feed(piece):
+                    break
+    return _parse_llm_json("".join(parts))
+
+
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    wait=wait_exponential(min=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+async def _complete_llm_async(client: AsyncAzureOpenAI, text: str, sem=None) -> str:
+    # The semaphore is taken per attempt, so a 429 backoff frees the slot.
+    parts, end = [], _JsonObjectEnd()
+    async with sem or nullcontext():
+        stream = await client.chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT,
+            messages=_llm_messages(text),
+            temperature=0.0,
+            stream=True,
+        )
+        async with stream:
+            async for chunk in stream:
+                piece = _delta_text(chunk)
+                if piece:
+                    parts.append(piece)
+                    if end.feed(piece):
+                        break
+    return "".join(parts)
+
+
+@cached_by_text(_LLM_CACHE_NS, cacheable=_llm_cacheable)
+async def extract_llm_fields_async(text: str, sem: asyncio.Semaphore | None = None,
+                                   client: AsyncAzureOpenAI | None = None):
+    """
+    Awaitable extract_llm_fields. Pass a shared `sem`/`client` when fanning
+    out many calls (see extract_llm_fields_many); 429s are retried with
+    exponential backoff.
+    """
+    if client is not None:
+        return _parse_llm_json(await _complete_llm_async(client, text, sem))
+    async with _async_aoai_client() as client:
+        return _parse_llm_json(await _complete_llm_async(client, text, sem))
+
+
+async def extract_llm_fields_many(texts: list, concurrency: int = AZURE_OPENAI_MAX_CONCURRENCY) -> list:
+    """
+    LLM extraction for many pay stub texts over one client, with at most
+    `concurrency` completions in flight. Results keep the order of `texts`.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    async with _async_aoai_client() as client:
+        return await asyncio.gather(
+            *[extract_llm_fields_async(text, sem=sem, client=client) for text in texts]
+        )
+
+# --- LLM Batch API (offline / bulk) ---
+# Needs a Global-Batch deployment and AZURE_OPENAI_API_VERSION >= 2024-10-21.
+_BATCH_TERMINAL = ("completed", "failed", "expired", "cancelled")
+
+
+def submit_llm_batch(texts: list) -> str:
+    """
+    Queue one extraction request per pay stub text on the Azure OpenAI Batch
+    API (24h completion window, about half the cost of interactive calls).
+    Request i is tagged custom_id "doc_{i}". Returns the batch id.
+    """
+    lines = [
+        orjson.dumps({
+            "custom_id": f"doc_{i}",
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {
+                "model": AZURE_OPENAI_DEPLOYMENT,
+                "messages": _llm_messages(text),
+                "temperature": 0.0,
+            },
+        })
+        for i, text in enumerate(texts)
+    ]
+    batch_file = aoai_client.files.create(
+        file=("paystub_llm_batch.jsonl", b"\n".join(lines)),
+        purpose="batch",
+    )
+    batch = aoai_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def poll_llm_batch(batch_id: str, interval: float = 60.0):
+    """Block until the batch reaches a terminal status and return it."""
+    while True:
+        batch = aoai_client.batches.retrieve(batch_id)
+        if batch.status in _BATCH_TERMINAL:
+            return batch
+        time.sleep(interval)
+
+
+def parse_llm_batch_results(batch) -> dict:
+    """
+    Read the output/error files of a finished batch.
+    Returns { custom_id: fields } where fields is what extract_llm_fields
+    would have returned, or {"error": ...} for requests that failed.
+    """
+    out = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in aoai_client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            rec = orjson.loads(line)
+            body = (rec.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if choices:
+                out[rec["custom_id"]] = _parse_llm_json(choices[0]["message"]["content"])
+            else:
+                out[rec["custom_id"]] = {"error": rec.get("error") or body.get("error")}
+    return out
 
 # ---------------- Main ----------------
-def process_paystub(file_bytes: bytes, filename: str):
-    print(f"[paystub] Processing {filename}")
+async def process_paystub_async(file_bytes: bytes, filename: str):
+    """
+    Structured DI and read+LLM run concurrently; the LLM call is chained
+    on the read result, so wall time is max(structured, read + LLM).
+    The OCR text is returned under "_raw_text" so callers need not re-read it.
+    """
+    log.info("[paystub] Processing %s", filename)
 
-    structured = extract_paystub_structured(file_bytes)
-    print("Structured fields:", structured.keys())
+    async def _read_then_llm():
+        text = await extract_read_text_async(file_bytes)
+        return text, await extract_llm_fields_async(text)
 
-    text = extract_read_text(file_bytes)
-    llm_fields = extract_llm_fields(text)
-    print("LLM fields:", llm_fields)
+    structured, (text, llm_fields) = await asyncio.gather(
+        extract_paystub_structured_async(file_bytes),
+        _read_then_llm(),
+    )
+    log.debug("Structured fields: %s", list(structured))
+    log.debug("LLM fields: %s", llm_fields)
+    if not isinstance(llm_fields, dict):
+        llm_fields = {}
 
     # Merge: structured first, fill gaps with LLM
     for k_map in [("TotalHours", "TotalHoursWorked"),
@@ -146,34 +451,38 @@ def process_paystub(file_bytes: bytes, filename: str):
                   ("JobTitle", "JobTitle")]:
         out_key, llm_key = k_map
         if out_key not in structured or not structured[out_key].get("value"):
+            # The prompt asks for {"value", "confidence"}; older replies were bare
+            llm_value = llm_fields.get(llm_key)
+            if isinstance(llm_value, dict):
+                llm_value = llm_value.get("value")
             structured[out_key] = {
-                "value": llm_fields.get(llm_key),
+                "value": llm_value,
                 "confidence": 80.0
             }
 
     return {
         "status": "success",
         "filename": filename,
-        "extracted_fields": structured
+        "extracted_fields": structured,
+        "_raw_text": text,
     }
 
-# ---------------- CLI ----------------
-import sys
-import json
+def process_paystub(file_bytes: bytes, filename: str):
+    return asyncio.run(process_paystub_async(file_bytes, filename))
 
+# ---------------- CLI ----------------
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python paystub_adaptor.py <path_to_file>")
-        sys.exit(1)
+        sys.exit("Usage: python paystub_adaptor.py <path_to_file>")
+    logging.basicConfig(format="%(message)s")
+    log.setLevel(logging.INFO)
 
     file_path = sys.argv[1]
     with open(file_path, "rb") as f:
         file_bytes = f.read()
 
-    # Run both structured + read + LLM steps
-    structured = extract_paystub_structured(file_bytes)
-    raw_text = extract_read_text(file_bytes)
-    llm_fields = extract_llm_fields(raw_text)  # make sure you have this function
-
-    combined = {**structured, **llm_fields}
-    print(json.dumps(combined, indent=2))
+    # structured + read + LLM, each issued once (structured overlaps read+LLM)
+    result = process_paystub(file_bytes, os.path.basename(file_path))
+    result.pop("_raw_text", None)
+    # stdout carries only the JSON result (progress goes to stderr via logging)
+    sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
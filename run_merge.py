@@ -6,124 +6,355 @@ Tiny CLI to run the two adapters and build the unified JSON.
 Usage:
     python run_merge.py <paystub_path> <ev_path>
     # you can pass one or both; missing files are treated as absent source
+
+Progress goes to stderr via logging, in one write at the end of the run
+(EMP_VERIFY_VERBOSE=0 to silence it); only the unified JSON is written to
+stdout.
 """
 
 from __future__ import annotations
 
+import io
+import os
 import sys
-import json
-import traceback
+import mmap
+import stat
+import errno
+import atexit
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from time import perf_counter
 
-# Adapters
-from paystub_adaptor import (
-    extract_paystub_structured,
-    extract_read_text,
-    extract_llm_fields,
-)
-from ev_adaptor import extract_ev_structured
+import orjson
+
+# Stdlib-only, unlike the adaptors and merge engine imported lazily below
+from normalize.paystub_fields import normalize_llm_into_struct
+
+log = logging.getLogger("run_merge")
+
+# OCR text must be this long and mention one of these before the LLM is called
+_LLM_MIN_CHARS = 64
+_LLM_TRIGGER = re.compile(r"hour|rate|wage|salary|title|position", re.IGNORECASE)
+
+# Inputs at least this large are mmap'd instead of read into a bytes copy
+_MMAP_MIN_BYTES = 1 << 20
+
+# CLI progress records collect here and reach stderr in one write per run
+_LOG_BUF = io.StringIO()
+_LOG_HANDLER = logging.StreamHandler(_LOG_BUF)
+_LOG_HANDLER.setFormatter(logging.Formatter("%(message)s"))
+
+# EMP_VERIFY_VERBOSE=0 silences progress checkpoints (and their timestamps)
+_VERBOSE = os.environ.get("EMP_VERIFY_VERBOSE", "1") == "1"
+
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool reused across run() calls. Only the thread calling
+    run() waits on its futures (pool tasks never submit-and-wait), so
+    concurrent runs queue behind each other instead of deadlocking.
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="emp-verify")
+    return _EXECUTOR
+
+
+atexit.register(lambda: _EXECUTOR and _EXECUTOR.shutdown(wait=False))
+
 
-# Merge
-from merge.merge_engine import build_unified
+# Adapters and merge engine are imported on first use: each adaptor pulls in
+# the Azure SDKs (and exits if its credentials are unset), so an EV-only run
+# never loads the paystub/OpenAI side.
+@lru_cache(maxsize=None)
+def _paystub_adaptor():
+    import paystub_adaptor
+    return paystub_adaptor
+
+
+@lru_cache(maxsize=None)
+def _ev_adaptor():
+    import ev_adaptor
+    return ev_adaptor
+
+
+@lru_cache(maxsize=None)
+def _merge_engine():
+    from merge import merge_engine
+    return merge_engine
+
+
+def _flush_log() -> None:
+    """Write everything buffered in _LOG_BUF to stderr and reset it."""
+    with _LOG_HANDLER.lock:
+        out = _LOG_BUF.getvalue()
+        _LOG_BUF.seek(0)
+        _LOG_BUF.truncate(0)
+    if out:
+        sys.stderr.write(out)
 
 
 def _checkpoint(label: str, t0: float | None = None) -> float:
     """
     Print a progress checkpoint and optionally the elapsed time since t0.
-    Returns a fresh timestamp so you can chain checkpoints.
+    Returns a fresh timestamp so you can chain checkpoints, or 0.0 without
+    reading the clock when checkpoints are disabled.
     """
+    if not _VERBOSE:
+        return 0.0
     now = perf_counter()
     if t0 is None:
-        print(f"[chk] {label}")
+        log.info(f"[chk] {label}")
     else:
-        print(f"[chk] {label}  (Δ {now - t0:.2f}s)")
+        log.info(f"[chk] {label}  (Δ {now - t0:.2f}s)")
     return now
 
 
-def run(paystub_path: str | None, ev_path: str | None):
-    print("=== merge pipeline start ===")
-    t_all = perf_counter()
+def _read_file_fast(path: Path) -> bytes | memoryview:
+    """
+    Read a whole input file, advising the kernel of sequential access so it
+    starts readahead before the first read. Files of _MMAP_MIN_BYTES or more
+    are memory-mapped rather than copied onto the heap; the returned
+    memoryview is uploaded straight from the page cache and the mapping is
+    released when the last view of it is dropped. Pipes and other special
+    files (e.g. /dev/stdin, <(...)) report size 0 and are read to EOF. Falls
+    back to Path.read_bytes() where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return path.read_bytes()
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass  # advisory only (e.g. pipes, some network filesystems)
+        st = os.fstat(fd)
+        size = st.st_size
+        if not stat.S_ISREG(st.st_mode) or size == 0:
+            return b"".join(iter(lambda: os.read(fd, 1 << 16), b""))
+        if size >= _MMAP_MIN_BYTES:
+            return memoryview(mmap.mmap(fd, 0, access=mmap.ACCESS_READ))
+        buf = bytearray(size)
+        view = memoryview(buf)
+        n = 0
+        while n < size:
+            got = os.readv(fd, [view[n:]])
+            if not got:
+                break
+            n += got
+        return bytes(view[:n])
+    finally:
+        os.close(fd)
 
-    paystub_raw = None
-    ev_raw = None
 
-    # ---------- PAYSTUB ----------
-    if paystub_path and Path(paystub_path).exists():
-        print(f"[paystub] input: {paystub_path}")
-        t0 = _checkpoint("read paystub bytes")
-        ps_bytes = Path(paystub_path).read_bytes()
+def _read_input(path: str | None) -> bytes | memoryview | None:
+    """
+    Bytes of one input, or None when no path was given or nothing readable is
+    there. The read itself is the existence check (no stat() beforehand).
+    """
+    if not path:
+        return None
+    try:
+        return _read_file_fast(Path(path))
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+    except OSError as exc:
+        if exc.errno == errno.ELOOP:  # symlink loop: absent, as Path.exists() said
+            return None
+        raise
 
-        try:
-            t0 = _checkpoint("DI structured extraction (prebuilt-payStub.us)", t0)
-            ps_struct = extract_paystub_structured(ps_bytes)
-            print(f"[paystub] structured keys: {len(ps_struct)}")
-        except Exception:
-            print("[paystub] ❌ structured extraction failed:")
-            traceback.print_exc()
-            ps_struct = {}
 
-        try:
-            t0 = _checkpoint("OCR read (prebuilt-read)", t0)
-            raw_text = extract_read_text(ps_bytes)
-            print(f"[paystub] OCR chars: {len(raw_text)}")
-        except Exception:
-            print("[paystub] ❌ OCR read failed:")
-            traceback.print_exc()
-            raw_text = ""
+def _read_inputs(*paths: str | None) -> list[bytes | memoryview | None]:
+    """
+    Read all inputs with their reads in flight together, so the two disk
+    reads overlap instead of running back to back.
+    """
+    if sum(1 for p in paths if p) < 2:
+        return [_read_input(p) for p in paths]
+    return list(_get_executor().map(_read_input, paths))
 
-        try:
-            t0 = _checkpoint("LLM extraction (hours/rate/title)", t0)
-            llm = extract_llm_fields(raw_text) if raw_text else {}
-            # flatten/normalize LLM into paystub schema
-            if isinstance(llm, dict):
-                for k, v in llm.items():
-                    if isinstance(v, dict) and "value" in v:
-                        ps_struct[k] = v
-                    else:
-                        ps_struct[k] = {"value": v, "confidence": 80.0}
-            print(f"[paystub] after LLM keys: {len(ps_struct)}")
-        except Exception:
-            print("[paystub] ❌ LLM extraction failed:")
-            traceback.print_exc()
-
-        paystub_raw = ps_struct
-        _ = _checkpoint("paystub done", t0)
+
+def _report_input(name: str, path: str | None, data: bytes | memoryview | None) -> None:
+    if data is not None:
+        log.info(f"[{name}] input: {path}")
+    elif not path:
+        log.info(f"[{name}] (skipped) no file provided")
     else:
-        print("[paystub] (skipped) no file provided or path does not exist")
+        log.info(f"[{name}] (skipped) file not found: {path}")
 
-    # ---------- EMPLOYMENT VERIFICATION ----------
-    if ev_path and Path(ev_path).exists():
-        print(f"[ev] input: {ev_path}")
-        t0 = _checkpoint("read EV bytes")
-        ev_bytes = Path(ev_path).read_bytes()
 
-        try:
-            t0 = _checkpoint("DI custom model extraction", t0)
-            ev_struct = extract_ev_structured(ev_bytes)
-            print(f"[ev] structured keys: {len(ev_struct)}")
-        except Exception:
-            print("[ev] ❌ EV extraction failed:")
-            traceback.print_exc()
-            ev_struct = {}
-
-        ev_raw = ev_struct
-        _ = _checkpoint("ev done", t0)
+def _start_warmup(name: str, adaptor) -> None:
+    """Fire adaptor.warmup() on the pool; its completion is logged as a checkpoint."""
+    t0 = _checkpoint(f"[{name}] warm up Azure clients")
+    _get_executor().submit(adaptor.warmup).add_done_callback(
+        lambda _f: _checkpoint(f"[{name}] warmup done", t0)
+    )
+
+
+def submit_di_pair(ps_bytes: bytes | memoryview | None,
+                   ev_bytes: bytes | memoryview | None):
+    """
+    Start the paystub (prebuilt-payStub.us) and EV analyses without waiting:
+    both uploads go out together on the pool and the SDK polls each LRO on
+    its own background thread. Returns (finish_ps, finish_ev), zero-argument
+    callables that block for the fields, or None for an absent input; a
+    failed submission is raised by the matching finish call.
+    """
+    ex = _get_executor()
+    f_ps = f_ev = None
+    if ps_bytes is not None:
+        _checkpoint("DI structured extraction (prebuilt-payStub.us)")
+        f_ps = ex.submit(_paystub_adaptor().begin_paystub_structured, ps_bytes)
+    if ev_bytes is not None:
+        _checkpoint("DI custom model extraction")
+        f_ev = ex.submit(_ev_adaptor().begin_ev_structured, ev_bytes)
+    return (
+        (lambda: f_ps.result()()) if f_ps else None,
+        (lambda: f_ev.result()()) if f_ev else None,
+    )
+
+
+def _llm_skip_reason(raw_text: str) -> str | None:
+    """Why the LLM call would be wasted on this OCR text, or None to make it."""
+    if len(raw_text) < _LLM_MIN_CHARS:
+        return f"OCR text under {_LLM_MIN_CHARS} chars"
+    if not _LLM_TRIGGER.search(raw_text):
+        return "no hours/rate/title keywords in OCR text"
+    return None
+
+
+def _run_paystub(ps_bytes: bytes | memoryview, finish_struct, t_struct: float) -> dict:
+    """
+    OCR read runs while the structured analysis (already submitted by
+    submit_di_pair) is in flight; the LLM is chained on the OCR text before
+    the structured result is collected. Each stage keeps its own failure
+    handling. Waits on pool futures, so call it from run()'s thread, never
+    from a pool task.
+    """
+    ps = _paystub_adaptor()
+    ex = _get_executor()
+    t0 = _checkpoint("OCR read (prebuilt-read)")
+    f_ocr = ex.submit(ps.extract_read_text, ps_bytes)
+
+    try:
+        raw_text = f_ocr.result()
+        log.info(f"[paystub] OCR chars: {len(raw_text)}")
+    except Exception:
+        log.exception("[paystub] ❌ OCR read failed")
+        raw_text = ""
+
+    skip = _llm_skip_reason(raw_text)
+    if skip:
+        t0 = _checkpoint(f"LLM skipped: {skip}", t0)
+        f_llm = None
     else:
-        print("[ev] (skipped) no file provided or path does not exist")
+        t0 = _checkpoint("LLM extraction (hours/rate/title)", t0)
+        f_llm = ex.submit(ps.extract_llm_fields, raw_text)
+
+    try:
+        ps_struct = finish_struct()
+        log.info(f"[paystub] structured keys: {len(ps_struct)}")
+    except Exception:
+        log.exception("[paystub] ❌ structured extraction failed")
+        ps_struct = {}
+    _checkpoint("DI structured done", t_struct)
+
+    try:
+        llm = f_llm.result() if f_llm else {}
+    except Exception:
+        log.exception("[paystub] ❌ LLM extraction failed")
+        llm = {}
+    _checkpoint("LLM done", t0)
+
+    # flatten/normalize LLM into paystub schema
+    normalize_llm_into_struct(ps_struct, llm)
+    log.info(f"[paystub] after LLM keys: {len(ps_struct)}")
+    return ps_struct
+
+
+def _run_ev(finish_ev, t0: float) -> dict:
+    try:
+        ev_struct = finish_ev()
+        log.info(f"[ev] structured keys: {len(ev_struct)}")
+    except Exception:
+        log.exception("[ev] ❌ EV extraction failed")
+        ev_struct = {}
+    _checkpoint("ev done", t0)
+    return ev_struct
+
+
+def run(paystub_path: str | None, ev_path: str | None):
+    try:
+        _run_pipeline(paystub_path, ev_path)
+    finally:
+        _flush_log()
+
+
+def _run_pipeline(paystub_path: str | None, ev_path: str | None):
+    log.info("=== merge pipeline start ===")
+    t_all = perf_counter()
+
+    # ---------- WARM UP (connections open while the inputs are read) ----------
+    # Adaptors are imported here, on the calling thread, never in pool tasks.
+    if paystub_path:
+        _start_warmup("paystub", _paystub_adaptor())
+    if ev_path:
+        _start_warmup("ev", _ev_adaptor())
+
+    # ---------- READ INPUTS ----------
+    t0 = _checkpoint("read input bytes")
+    ps_bytes, ev_bytes = _read_inputs(paystub_path, ev_path)
+    _checkpoint("read done", t0)
+
+    _report_input("paystub", paystub_path, ps_bytes)
+    _report_input("ev", ev_path, ev_bytes)
+
+    # ---------- PAYSTUB + EMPLOYMENT VERIFICATION (concurrent) ----------
+    t0 = _checkpoint("extract paystub + EV")
+    # Both DI analyses are submitted up front and poll in the background;
+    # OCR + LLM run meanwhile, then each result is collected on this thread.
+    finish_ps, finish_ev = submit_di_pair(ps_bytes, ev_bytes)
+    merge = _merge_engine()
+    paystub_raw = _run_paystub(ps_bytes, finish_ps, t0) if finish_ps else None
+    # Normalizing the paystub here overlaps the EV LRO still polling
+    ps_prepped = merge.prep_paystub(paystub_raw)
+    ev_raw = _run_ev(finish_ev, t0) if finish_ev else None
+    ev_prepped = merge.prep_ev(ev_raw)
+    _ = _checkpoint("extraction done", t0)
 
     # ---------- MERGE ----------
-    t0 = _checkpoint("merge build_unified")
-    unified = build_unified(paystub_raw, ev_raw)
+    t0 = _checkpoint("merge combine")
+    unified = merge.combine(ps_prepped, ev_prepped)
     _ = _checkpoint("merge done", t0)
 
-    print("=== final unified JSON ===")
-    print(json.dumps(unified, indent=2))
+    log.info("=== final unified JSON ===")
+    # orjson emits UTF-8 bytes; write them as-is so non-ASCII names survive
+    # a stdout whose text encoding is not UTF-8 (e.g. a cp1252 console)
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(unified, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    sys.stdout.buffer.flush()
 
-    print(f"=== pipeline finished in {perf_counter() - t_all:.2f}s ===")
+    log.info(f"=== pipeline finished in {perf_counter() - t_all:.2f}s ===")
 
 
 if __name__ == "__main__":
+    # Root stays at WARNING so the Azure SDK's per-request INFO logs stay quiet;
+    # run_merge's own records are buffered and flushed when run() returns.
+    logging.basicConfig(format="%(message)s")
+    log.addHandler(_LOG_HANDLER)
+    log.propagate = False
+    log.setLevel(logging.INFO if _VERBOSE else logging.WARNING)
     ps_arg = sys.argv[1] if len(sys.argv) > 1 else None
     ev_arg = sys.argv[2] if len(sys.argv) > 2 else None
     run(ps_arg, ev_arg)
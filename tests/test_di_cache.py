@@ -0,0 +1,64 @@
+"""di_cache decorators against a throwaway diskcache directory."""
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from diskcache import Cache
+
+import di_cache
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch):
+    cache = Cache(str(tmp_path))
+    monkeypatch.setattr(di_cache, "_cache", cache)
+    yield cache
+    cache.close()
+
+
+def _parsed(fields) -> bool:
+    return "raw_response" not in fields
+
+
+def test_uncacheable_results_are_not_stored():
+    calls = []
+
+    @di_cache.cached_by_text("test", cacheable=_parsed)
+    def extract(text):
+        calls.append(text)
+        return {"raw_response": ""} if text == "bad" else {"EmployerName": text}
+
+    extract("bad")
+    extract("bad")
+    extract("good")
+    assert extract("good") == {"EmployerName": "good"}
+    assert calls == ["bad", "bad", "good"]
+
+
+def test_uncacheable_async_results_are_not_stored():
+    calls = []
+
+    @di_cache.cached_by_text("test", cacheable=_parsed)
+    async def extract(text):
+        calls.append(text)
+        return {"raw_response": "{\"Employer"}
+
+    asyncio.run(extract("truncated"))
+    asyncio.run(extract("truncated"))
+    assert calls == ["truncated", "truncated"]
+
+
+def test_import_does_not_create_cache(tmp_path):
+    cache_dir = tmp_path / "cache"
+    env = {**os.environ, "DI_CACHE_DIR": str(cache_dir), "EMP_VERIFY_CACHE": "1",
+           "PYTHONPATH": os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}
+    code = "import di_cache; di_cache.cached_by_text('t')(lambda text: text)"
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+    assert not cache_dir.exists()
+    assert not (tmp_path / ".di_cache").exists()
+    code += "('x'); assert di_cache.lookup(di_cache.text_key('x', 't')) == 'x'"
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+    assert cache_dir.is_dir()
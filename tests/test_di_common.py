@@ -0,0 +1,65 @@
+"""Request-shape checks for di_common.begin_analyze (no network: the request is stopped before send)."""
+
+import os
+from io import BytesIO
+
+import pytest
+from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
+
+import di_common
+
+
+class _Stop(Exception):
+    pass
+
+
+def _sent_content_type(file_or_bytes) -> str:
+    seen = []
+
+    def hook(request):
+        seen.append(request.http_request.headers.get("Content-Type"))
+        raise _Stop
+
+    client = DocumentIntelligenceClient(
+        "https://example.cognitiveservices.azure.com", AzureKeyCredential("key")
+    )
+    with pytest.raises(_Stop):
+        di_common.begin_analyze(client, "prebuilt-read", file_or_bytes, raw_request_hook=hook)
+    return seen[0]
+
+
+@pytest.mark.parametrize("body", [
+    b"%PDF-1.7",
+    bytearray(b"%PDF-1.7"),
+    memoryview(b"%PDF-1.7"),
+    BytesIO(b"%PDF-1.7"),
+])
+def test_document_body_is_sent_as_octet_stream(body):
+    assert _sent_content_type(body) == "application/octet-stream"
+
+
+class _Unavailable:
+    """Client stub whose analyze call always fails with a 503."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def begin_analyze_document(self, **kwargs):
+        self.calls += 1
+        kwargs[di_common.BODY_ARG].read()
+        err = HttpResponseError("Service Unavailable")
+        err.status_code = 503
+        raise err
+
+
+def test_non_seekable_stream_is_sent_once():
+    r, w = os.pipe()
+    os.write(w, b"%PDF-1.7")
+    os.close(w)
+    client = _Unavailable()
+    with open(r, "rb", buffering=0) as pipe:
+        with pytest.raises(HttpResponseError):
+            di_common.begin_analyze(client, "prebuilt-read", pipe)
+    assert client.calls == 1
@@ -0,0 +1,60 @@
+"""normalize_paystub_batch must agree with normalize_paystub value for value."""
+
+import copy
+import math
+import random
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from merge.merge_engine import _PS_BATCH_COLUMNS, normalize_paystub, normalize_paystub_batch
+
+_DATES = [
+    "01/05/2024", "1-5-2024", "2024-01-05", "01/05/24", "01-05-24", "05-Jan-2024",
+    "05 Jan 2024", "  01/05/2024 ", "Jan 5th 2024 pay 01 05 2024", "1.5.2024",
+    "13/45/2024", "11", "01/05/3000", "pay date: 1 5 24", "2024-02-30",
+]
+_TEXT = ["john  doe", "  ACME\nCorp  ", "x", "Nguyễn Văn", "   "]
+_TITLES = ["truck   DRIVER ", "ceo", "  ", "Senior CNA", "registered nurse\n"]
+_MONEY = ["$3, 461. 54", "$ 6500", "1,234.00", "$3 ,461 .54", "   ", 1234.5]
+_HOURS = [80, 0, 37.5, "80.00", " 40 ", "approx 32 hrs", "hours: 12.5 total", "n/a", "   "]
+_FALSY = [None, "", 0]
+_EIN = ["12-3456789", "", None, "  12 3456789 "]
+
+_POOLS = {
+    "EmployeeName": _TEXT, "EmployerName": _TEXT, "EmployerAddress": _TEXT,
+    "EIN": _EIN, "JobTitle": _TITLES, "PayDate": _DATES,
+    "CurrentPeriodGrossPay": _MONEY, "TotalHoursWorked": _HOURS,
+    "PayPeriodStartDate": _DATES, "PayPeriodEndDate": _DATES,
+}
+
+
+def _records(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    records = [None, {}, {"JobTitle": {"value": "  ", "confidence": 1}}]
+    for _ in range(n):
+        rec = {}
+        for raw, pool in _POOLS.items():
+            roll = rng.random()
+            if roll < 0.15:
+                continue  # missing key
+            value = rng.choice(_FALSY) if roll < 0.3 else rng.choice(pool)
+            rec[raw] = {"value": value, "confidence": rng.choice([None, 55, 91.5])}
+        records.append(rec)
+    return records
+
+
+def _nan_to_none(v):
+    return None if isinstance(v, float) and math.isnan(v) else v
+
+
+def test_batch_matches_scalar():
+    records = _records(500)
+    frame = normalize_paystub_batch(copy.deepcopy(records))
+    for i, rec in enumerate(records):
+        scalar = normalize_paystub(copy.deepcopy(rec))
+        for _, canon, _ in _PS_BATCH_COLUMNS:
+            got = _nan_to_none(frame.at[i, canon])
+            want = scalar[canon].value if canon in scalar else None
+            assert got == want, (i, canon, rec)
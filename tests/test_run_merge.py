@@ -0,0 +1,31 @@
+"""run_merge input reading (no Azure calls)."""
+
+import os
+
+import run_merge
+
+
+def test_regular_file_is_read_whole(tmp_path):
+    path = tmp_path / "stub.pdf"
+    path.write_bytes(b"%PDF-1.7" * 1000)
+    assert bytes(run_merge._read_input(str(path))) == b"%PDF-1.7" * 1000
+
+
+def test_pipe_is_read_to_eof():
+    # A pipe's fstat size is 0; the read must not stop there
+    r, w = os.pipe()
+    os.write(w, b"data" * 1000)  # fits the pipe buffer, so no writer thread
+    os.close(w)
+    try:
+        assert run_merge._read_input(f"/dev/fd/{r}") == b"data" * 1000
+    finally:
+        os.close(r)
+
+
+def test_unreachable_paths_are_absent(tmp_path):
+    stub = tmp_path / "stub.pdf"
+    stub.write_bytes(b"%PDF-1.7")
+    loop = tmp_path / "loop"
+    loop.symlink_to(loop)
+    for path in (tmp_path / "missing.pdf", tmp_path, stub / "x", loop):
+        assert run_merge._read_input(str(path)) is None